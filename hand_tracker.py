@@ -1,40 +1,142 @@
+import argparse
+import contextlib
 import cv2
 import numpy as np
-from collections import deque
+import threading
 import time
 import os
+import signal
+import sys
 import tempfile
 import urllib.request
 
 # New MediaPipe API imports
 from mediapipe.tasks.python.vision import HandLandmarker, HandLandmarkerOptions
+from mediapipe.tasks.python.vision import RunningMode as VisionRunningMode
 from mediapipe.tasks.python import BaseOptions
 from mediapipe.tasks.python.vision.core import image as mp_image_module
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the gesture kernels below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _count_fingers(hands, tips, pips):
+    """Count extended fingers for each hand in an (H, 21, 2) int32 array"""
+    counts = np.zeros(hands.shape[0], dtype=np.int64)
+    for i in range(hands.shape[0]):
+        # Thumb is special: check horizontal distance instead
+        extended = 1 if abs(hands[i, tips[0], 0] - hands[i, pips[0], 0]) > 30 else 0
+
+        # For most fingers, tip should be above PIP when extended
+        # (lower y value since origin is top-left)
+        for k in range(1, len(tips)):
+            if hands[i, tips[k], 1] < hands[i, pips[k], 1] - 10:
+                extended += 1
+
+        counts[i] = extended
+    return counts
+
+
+@njit(cache=True, fastmath=True)
+def _pinch(hands, threshold_sq):
+    """Check thumb tip (4) to index tip (8) distance for each hand in an (H, 21, 2) array"""
+    pinching = np.zeros(hands.shape[0], dtype=np.bool_)
+    for i in range(hands.shape[0]):
+        dx = hands[i, 4, 0] - hands[i, 8, 0]
+        dy = hands[i, 4, 1] - hands[i, 8, 1]
+        # Compare squared distances to skip the square root
+        pinching[i] = dx * dx + dy * dy < threshold_sq
+    return pinching
+
+
+@njit(cache=True, fastmath=True)
+def _swipe(ring, n, w, horizontal_threshold, vertical_threshold):
+    """Compare oldest and newest wrist positions in the ring: 1 = right, -1 = left, 0 = none"""
+    size = ring.shape[0]
+    start = (w - n) % size
+    end = (w - 1) % size
+
+    horizontal_distance = ring[end, 0] - ring[start, 0]
+    vertical_distance = abs(ring[end, 1] - ring[start, 1])
+
+    if abs(horizontal_distance) > horizontal_threshold and vertical_distance < vertical_threshold:
+        if abs(horizontal_distance) > vertical_distance * 1.5:
+            return 1 if horizontal_distance > 0 else -1
+    return 0
 
-class HandTracker:
-    def __init__(self):
-        # Download model if needed
-        model_url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-        model_path = os.path.join(tempfile.gettempdir(), "hand_landmarker.task")
-        
-        if not os.path.exists(model_path):
-            print(f"Downloading hand landmarker model to {model_path}...")
-            urllib.request.urlretrieve(model_url, model_path)
-            print("downloaded")
-
-        base_options = BaseOptions(model_asset_path=model_path)
-        options = HandLandmarkerOptions(
-            base_options=base_options,
-            num_hands=2,
-            min_hand_detection_confidence=0.4,
-            min_hand_presence_confidence=0.4,
-            min_tracking_confidence=0.4
-        )
-        self.hand_landmarker = HandLandmarker.create_from_options(options)
 
-        # Store recent hand positions for gesture detection
-        self.position_history = deque(maxlen=10)
+class HandTracker:
+    # Landmark index pairs for the bones drawn by draw_landmarks
+    _CONNECTIONS = np.array([
+        # Thumb
+        (0, 1), (1, 2), (2, 3), (3, 4),
+        # Index finger
+        (0, 5), (5, 6), (6, 7), (7, 8),
+        # Middle finger
+        (5, 9), (9, 10), (10, 11), (11, 12),
+        # Ring finger
+        (9, 13), (13, 14), (14, 15), (15, 16),
+        # Pinky
+        (13, 17), (17, 18), (18, 19), (19, 20),
+        # Wrist connections
+        (0, 17)
+    ], dtype=np.int32)
+
+    # Finger tip and PIP joint landmark indices
+    # Thumb: 4, 3
+    # Index: 8, 6
+    # Middle: 12, 10
+    # Ring: 16, 14
+    # Pinky: 20, 18
+    _TIPS = np.array([4, 8, 12, 16, 20], dtype=np.intp)
+    _PIPS = np.array([3, 6, 10, 14, 18], dtype=np.intp)
+
+    # Pinch when thumb and index tips are within 40 px (squared), tune this threshold
+    _pinch_threshold_sq = 40 * 40
+
+    def __init__(self, model_path=None, skin_gate=False):
+        # A local model (e.g. an INT8-quantized hand_landmarker.task) can be supplied
+        # directly or through HAND_LANDMARKER_MODEL; otherwise use the float16 default
+        model_path = model_path or os.environ.get('HAND_LANDMARKER_MODEL')
+        if model_path:
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"Hand landmarker model not found: {model_path}")
+        else:
+            # Download model if needed
+            model_url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+            model_path = os.path.join(tempfile.gettempdir(), "hand_landmarker.task")
+
+            if not os.path.exists(model_path):
+                print(f"Downloading hand landmarker model to {model_path}...")
+                urllib.request.urlretrieve(model_url, model_path)
+                print("downloaded")
+
+        # Results arrive on MediaPipe's worker thread, so guard them with a lock
+        self._result_lock = threading.Lock()
+        self._latest_landmarks = None
+        self._last_timestamp_ms = -1
+
+        # Prefer the GPU delegate, fall back to CPU (XNNPACK) if it can't initialize
+        try:
+            self.hand_landmarker = self._create_landmarker(model_path, BaseOptions.Delegate.GPU)
+            print("Hand landmarker using GPU delegate")
+        except Exception as e:
+            print(f"GPU delegate unavailable ({e}), falling back to CPU")
+            self.hand_landmarker = self._create_landmarker(model_path, BaseOptions.Delegate.CPU)
+
+        # Ring buffer of recent wrist positions for swipe detection
+        self._wrist_ring = np.zeros((10, 2), np.int32)
+        self._wrist_n = 0  # number of valid entries
+        self._wrist_w = 0  # next write index
+
+        # Swipe thresholds as a fraction of frame width so they hold at any resolution
+        self.swipe_horizontal_ratio = 0.375
+        self.swipe_vertical_ratio = 0.25
 
         # Gesture cooldown to prevent spam
         self.last_gesture_time = 0
@@ -44,162 +146,199 @@ class HandTracker:
         self.last_landmarks = None
         self.last_landmark_list = None  # Store the list format for drawing
 
-    def get_hand_landmarks(self, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp_image_module.Image(image_format=mp_image_module.ImageFormat.SRGB, data=rgb_frame)
-        
-        detection_result = self.hand_landmarker.detect(mp_image)
-        
-        if detection_result.hand_landmarks:
-            self.last_landmark_list = detection_result.hand_landmarks
-            self.last_landmarks = list(detection_result.hand_landmarks)
-            return self.last_landmarks
-        else:
+        # Reused BGR->RGB conversion buffer, reallocated only if the frame size changes
+        self._rgb = None
+
+        # Skip detection when the scene hasn't changed since the last detected frame,
+        # but still re-run it every few skipped frames so the cached result can't go stale
+        self._prev_small = None
+        self.static_diff_threshold = 2
+        self.static_revalidate_frames = 15
+        self._static_skips = 0
+
+        # Optionally skip detection when too few skin-toned pixels are in view. Off by
+        # default: the fixed HSV range misses darker skin tones and dim or tinted light
+        self.skin_gate_min_pixels = 50 if skin_gate else 0
+        self.skin_hsv_lower = (0, 30, 60)
+        self.skin_hsv_upper = (25, 150, 255)
+        self._skin_gate_suppressing = False
+
+        # Compile the gesture kernels now rather than on the first detected hand
+        warmup = np.zeros((1, 21, 2), np.int32)
+        _count_fingers(warmup, self._TIPS, self._PIPS)
+        _pinch(warmup, self._pinch_threshold_sq)
+        _swipe(self._wrist_ring, 8, 0, 1.0, 1.0)
+
+    def _create_landmarker(self, model_path, delegate):
+        base_options = BaseOptions(model_asset_path=model_path, delegate=delegate)
+        options = HandLandmarkerOptions(
+            base_options=base_options,
+            running_mode=VisionRunningMode.LIVE_STREAM,
+            result_callback=self._on_result,
+            num_hands=2,
+            min_hand_detection_confidence=0.4,
+            min_hand_presence_confidence=0.4,
+            min_tracking_confidence=0.4
+        )
+        return HandLandmarker.create_from_options(options)
+
+    def _on_result(self, detection_result, output_image, timestamp_ms):
+        """Receive async detection results from the landmarker's worker thread"""
+        with self._result_lock:
+            if detection_result.hand_landmarks:
+                self.last_landmark_list = detection_result.hand_landmarks
+                self.last_landmarks = list(detection_result.hand_landmarks)
+                self._latest_landmarks = self.last_landmarks
+            else:
+                self._latest_landmarks = None
+
+    def get_hand_landmarks(self, frame, timestamp_ms=None):
+        """Queue frame for detection and return the most recent result (may lag a frame)"""
+        if self._is_static(frame):
+            with self._result_lock:
+                return self._latest_landmarks
+
+        if not self._has_skin(frame):
+            if not self._skin_gate_suppressing:
+                print("Skin gate: no skin tones in view, skipping hand detection")
+                self._skin_gate_suppressing = True
+            with self._result_lock:
+                self._latest_landmarks = None
             return None
+        if self._skin_gate_suppressing:
+            print("Skin gate: skin tones in view, resuming hand detection")
+            self._skin_gate_suppressing = False
+
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        # LIVE_STREAM mode rejects timestamps that don't strictly increase
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        # mp.Image copies the pixels on construction, so the buffer is free to reuse next frame
+        mp_image = mp_image_module.Image(image_format=mp_image_module.ImageFormat.SRGB, data=self._rgb)
+
+        self.hand_landmarker.detect_async(mp_image, timestamp_ms)
+
+        with self._result_lock:
+            return self._latest_landmarks
+
+    def _is_static(self, frame):
+        """Check a tiny grayscale thumbnail against the last detected frame"""
+        small = cv2.resize(frame, (32, 24), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+        if (self._prev_small is not None
+                and self._static_skips < self.static_revalidate_frames
+                and np.abs(gray - self._prev_small).mean() < self.static_diff_threshold):
+            self._static_skips += 1
+            return True
+
+        self._prev_small = gray
+        self._static_skips = 0
+        return False
 
-    def draw_landmarks(self, frame, hand_landmarks):
-        """Draw hand landmarks on frame"""
+    def _has_skin(self, frame):
+        """Cheap check for enough skin-toned pixels anywhere in the frame"""
+        if self.skin_gate_min_pixels <= 0:
+            return True
+
+        small = cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, self.skin_hsv_lower, self.skin_hsv_upper)
+        return cv2.countNonZero(mask) >= self.skin_gate_min_pixels
+
+    def draw_landmarks(self, frame, hand_landmarks, frame_shape=None):
+        """Draw hand landmarks on frame (pass frame_shape when frame is a cv2.UMat)"""
         if hand_landmarks is None or len(hand_landmarks) == 0:
             return
-            
+
+        if frame_shape is None:
+            frame_shape = frame.shape
+
         # Draw each hand's landmarks
-        for hand_landmark_list in hand_landmarks:
-            # Draw connections
-            connections = [
-                # Thumb
-                (0, 1), (1, 2), (2, 3), (3, 4),
-                # Index finger
-                (0, 5), (5, 6), (6, 7), (7, 8),
-                # Middle finger
-                (5, 9), (9, 10), (10, 11), (11, 12),
-                # Ring finger
-                (9, 13), (13, 14), (14, 15), (15, 16),
-                # Pinky
-                (13, 17), (17, 18), (18, 19), (19, 20),
-                # Wrist connections
-                (0, 17)
-            ]
-            
-            h, w = frame.shape[:2]
-            
-            # Draw connections
-            for connection in connections:
-                start_idx, end_idx = connection
-                if start_idx < len(hand_landmark_list) and end_idx < len(hand_landmark_list):
-                    start = hand_landmark_list[start_idx]
-                    end = hand_landmark_list[end_idx]
-                    
-                    start_x = int(start.x * w)
-                    start_y = int(start.y * h)
-                    end_x = int(end.x * w)
-                    end_y = int(end.y * h)
-                    
-                    cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 255, 0), 2)
-            
+        for pts in self.landmarks_to_array(hand_landmarks, frame_shape):
+            # Draw all connections in a single call, one 2-point polyline per bone
+            cv2.polylines(frame, pts[self._CONNECTIONS], False, (0, 255, 0), 2)
+
             # Draw landmarks
-            for landmark in hand_landmark_list:
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
+            for x, y in pts.tolist():
                 cv2.circle(frame, (x, y), 5, (0, 0, 255), -1)
 
     def get_landmark_coords(self, hand_landmarks, frame_shape):
-        """Convert normalized landmarks to pixel coordinates"""
-        h, w, _ = frame_shape
-        landmarks = []
+        """Convert normalized landmarks to a (21, 2) int32 array of pixel coordinates"""
+        return self.landmarks_to_array([hand_landmarks], frame_shape)[0]
+
+    def landmarks_to_array(self, hand_landmarks, frame_shape):
+        """Pack all hands into one (H, 21, 2) int32 array of pixel coordinates"""
+        h, w = frame_shape[:2]
+        n = sum(len(hand) for hand in hand_landmarks)
+
+        # Gather x and y into contiguous arrays, then scale to pixels in one go
+        xs = np.fromiter((lm.x for hand in hand_landmarks for lm in hand), dtype=np.float64, count=n)
+        ys = np.fromiter((lm.y for hand in hand_landmarks for lm in hand), dtype=np.float64, count=n)
+
+        pts = np.stack((xs * w, ys * h), axis=1).astype(np.int32)
+        return pts.reshape(len(hand_landmarks), -1, 2)
 
-        for lm in hand_landmarks:
-            # Convert normalized coordinates to pixels
-            x = int(lm.x * w)
-            y = int(lm.y * h)
-            landmarks.append((x, y))
+    def append_wrist(self, xy):
+        """Record the wrist position for the current frame"""
+        size = len(self._wrist_ring)
+        self._wrist_ring[self._wrist_w] = xy
+        self._wrist_w = (self._wrist_w + 1) % size
+        self._wrist_n = min(self._wrist_n + 1, size)
 
-        return landmarks
+    def clear_wrist_history(self):
+        self._wrist_n = 0
 
-    def detect_swipe(self, landmarks):
-        if len(self.position_history) < 8:
+    def detect_swipe(self, frame_width):
+        if self._wrist_n < 8:
             return None
 
-        wrist_positions = [pos[0] for pos in self.position_history]
-        
-        start_x = wrist_positions[0][0]
-        end_x = wrist_positions[-1][0]
-        start_y = wrist_positions[0][1]
-        end_y = wrist_positions[-1][1]
-        
-        horizontal_distance = end_x - start_x
-        vertical_distance = abs(end_y - start_y)
-
-        horizontal_threshold = 120
-        vertical_threshold = 80
-        
-        if abs(horizontal_distance) > horizontal_threshold and vertical_distance < vertical_threshold:
-            if abs(horizontal_distance) > vertical_distance * 1.5:
-                self.position_history.clear()
-                
-                if horizontal_distance > 0:
-                    return "swipe_right"
-                else:
-                    return "swipe_left"
-
-        return None
-
-    def calculate_distance(self, point1, point2):
-        """Calculate Euclidean distance between two points"""
-        return np.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
+        horizontal_threshold = self.swipe_horizontal_ratio * frame_width
+        vertical_threshold = self.swipe_vertical_ratio * frame_width
+
+        direction = _swipe(self._wrist_ring, self._wrist_n, self._wrist_w,
+                           horizontal_threshold, vertical_threshold)
+        if direction == 0:
+            return None
+
+        self.clear_wrist_history()
+        return "swipe_right" if direction > 0 else "swipe_left"
 
     def detect_pinch(self, landmarks):
         """Detect pinch gesture (thumb tip + index tip)"""
-        # Thumb tip = landmark 4, Index tip = landmark 8
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-
-        distance = self.calculate_distance(thumb_tip, index_tip)
+        return bool(self.detect_pinch_batch(landmarks[np.newaxis])[0])
 
+    def detect_pinch_batch(self, hands):
+        """Detect pinch for each hand in an (H, 21, 2) array"""
         # Pinch detected when distance is small
-        if distance < 40:  # pixels, tune this threshold
-            return True
-        return False
+        return _pinch(hands, self._pinch_threshold_sq)
 
     def count_extended_fingers(self, landmarks):
         """Count how many fingers are extended"""
-        # Finger tip and PIP joint landmark indices
-        # Thumb: 4, 3
-        # Index: 8, 6
-        # Middle: 12, 10
-        # Ring: 16, 14
-        # Pinky: 20, 18
-
-        finger_tips = [4, 8, 12, 16, 20]
-        finger_pips = [3, 6, 10, 14, 18]
-
-        extended_count = 0
-
-        for i in range(5):
-            tip = landmarks[finger_tips[i]]
-            pip = landmarks[finger_pips[i]]
-
-            # For most fingers, tip should be above PIP when extended
-            # (lower y value since origin is top-left)
-            if i == 0:  # Thumb is special
-                # Check horizontal distance for thumb
-                if abs(tip[0] - pip[0]) > 30:
-                    extended_count += 1
-            else:
-                if tip[1] < pip[1] - 10:  # Tip above PIP
-                    extended_count += 1
+        return int(self.count_extended_fingers_batch(landmarks[np.newaxis])[0])
 
-        return extended_count
+    def count_extended_fingers_batch(self, hands):
+        """Count extended fingers for each hand in an (H, 21, 2) array"""
+        return _count_fingers(hands, self._TIPS, self._PIPS)
 
-    def can_trigger_gesture(self):
+    def can_trigger_gesture(self, current_time=None):
         """Check if enough time has passed since last gesture"""
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.monotonic()
         if current_time - self.last_gesture_time > self.cooldown_seconds:
             return True
         return False
 
-    def mark_gesture_triggered(self):
+    def mark_gesture_triggered(self, current_time=None):
         """Mark that a gesture was just triggered"""
-        self.last_gesture_time = time.time()
+        if current_time is None:
+            current_time = time.monotonic()
+        self.last_gesture_time = current_time
 
     def __del__(self):
         """Cleanup when object is destroyed"""
@@ -207,101 +346,240 @@ class HandTracker:
             self.hand_landmarker.close()
 
 
-def main():
+def open_camera(width, height, fps=30):
+    """Open the default webcam with a single-frame buffer to avoid stale frames"""
+    # Use V4L2 directly on Linux so the buffer size property reaches the driver
+    if sys.platform.startswith("linux"):
+        cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+    else:
+        cap = cv2.VideoCapture(0)
+
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("buffer-size reduce failed")
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    return cap
+
+
+def enable_opencl():
+    """Turn on OpenCV's OpenCL path if a device is available; returns whether it's active"""
+    if not cv2.ocl.haveOpenCL():
+        return False
+    cv2.ocl.setUseOpenCL(True)
+    return cv2.ocl.useOpenCL()
+
+
+def to_numpy(frame):
+    """Return frame as a NumPy array, downloading it from the GPU if it's a cv2.UMat"""
+    # MediaPipe only accepts NumPy frames
+    return frame.get() if isinstance(frame, cv2.UMat) else frame
+
+
+def add_skin_gate_argument(parser):
+    """Add the --skin-gate flag shared by the tracker demo and the Spotify controller"""
+    parser.add_argument("--skin-gate", action="store_true",
+                        help="skip hand detection when no skin tones are in view (may miss some skin tones/lighting)")
+
+
+@contextlib.contextmanager
+def grab_frames(cap):
+    """Run a FrameGrabber on cap with Ctrl+C wired to stop it.
+
+    On exit, even through an exception, the previous SIGINT handler is restored
+    and the capture is released once the grabber is done with it.
+    """
+    grabber = FrameGrabber(cap)
+    grabber.start()
+    # Ctrl+C is the only way out without a window. Stopping the grabber also ends
+    # a read() that's waiting on a camera with no frames
+    previous_sigint = signal.signal(signal.SIGINT, lambda signum, frame: grabber.request_stop())
+    try:
+        yield grabber
+    finally:
+        signal.signal(signal.SIGINT, previous_sigint)
+        # Never release the capture while the grabber may still be inside cap.read()
+        if grabber.stop():
+            cap.release()
+        else:
+            print("camera read still in progress, leaving capture open")
+
+
+class FrameGrabber(threading.Thread):
+    """Reads frames on a background thread, keeping only the newest one"""
+
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.latest = None
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set() and self.cap.isOpened():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            # Overwrite any frame the main loop hasn't picked up yet
+            with self._lock:
+                self.latest = frame
+                self._new_frame.set()
+
+        # Wake up a waiting reader so it can see the grabber has stopped
+        self._stop_event.set()
+        self._new_frame.set()
+
+    def read(self):
+        """Wait for a frame newer than the last one read; returns (ret, frame) like cap.read()"""
+        # Poll so a reader can't block forever once the grabber has exited or been
+        # asked to stop, even if the camera has stopped delivering frames
+        while not self._new_frame.wait(timeout=0.1):
+            if self._stop_event.is_set() or not self.is_alive():
+                return False, None
+        if self._stop_event.is_set():
+            return False, None
+
+        with self._lock:
+            frame = self.latest
+            self.latest = None
+            self._new_frame.clear()
+        return frame is not None, frame
+
+    def request_stop(self):
+        """Ask the thread to stop without waiting for it; safe to call from a signal handler"""
+        self._stop_event.set()
+
+    def stop(self, timeout=2.0):
+        """Stop grabbing; returns True once the thread has exited and the capture is safe to release"""
+        self.request_stop()
+        self.join(timeout=timeout)
+        return not self.is_alive()
+
+
+def main(show=True, skin_gate=False):
     # Initialize webcam with lower resolution for better performance
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)  # Reduced from 640
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)  # Reduced from 480
-    cap.set(cv2.CAP_PROP_FPS, 30)
+    cap = open_camera(320, 240)  # Reduced from 640x480
+
+    tracker = HandTracker(skin_gate=skin_gate)
 
-    tracker = HandTracker()
+    # Run flip/draw/display on the GPU via cv2.UMat when OpenCL is available
+    use_umat = show and enable_opencl()
 
     # FPS tracking
-    prev_time = time.time()
+    prev_time = time.monotonic()
     frame_count = 0
 
     # Lower = more responsive but slower FPS
     # Higher = faster FPS but less responsive
     process_every_n_frames = 3  # Increased from 2 for M2 Pro
 
-    print("Optimized hand tracking started. Press 'q' to quit.")
+    print("Optimized hand tracking started. " + ("Press 'q' to quit." if show else "Press Ctrl+C to quit."))
     print(f"Camera FPS: {cap.get(cv2.CAP_PROP_FPS)}")
     print(f"Processing every {process_every_n_frames} frames")
+    print(f"OpenCL: {'on' if use_umat else 'off'}")
 
     # Store last detected values to display between frames
     last_gesture = None
     last_finger_count = 0
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        # Flip frame horizontally for mirror effect
-        frame = cv2.flip(frame, 1)
-
-        frame_count += 1
-
-        # Only process hand detection every N frames for performance
-        if frame_count % process_every_n_frames == 0:
-            hand_landmarks = tracker.get_hand_landmarks(frame)
-
-            # Process gestures if hands detected
-            if hand_landmarks:
-                for hand_lms in hand_landmarks:
-                    # Get pixel coordinates
-                    landmarks = tracker.get_landmark_coords(hand_lms, frame.shape)
-
-                    # Store position history
-                    tracker.position_history.append(landmarks)
-
-                    # Detect gestures
-                    gesture = None
-
-                    # Check swipe
-                    swipe = tracker.detect_swipe(landmarks)
-                    if swipe and tracker.can_trigger_gesture():
-                        gesture = swipe
-                        tracker.mark_gesture_triggered()
-                        last_gesture = gesture
-
-                    # Check pinch
-                    if tracker.detect_pinch(landmarks):
-                        gesture = "pinch"
-                        last_gesture = gesture
-
-                    # Count fingers
-                    last_finger_count = tracker.count_extended_fingers(landmarks)
-
-        # Always draw landmarks (even on skipped frames, use cached)
-        if tracker.last_landmarks:
-            tracker.draw_landmarks(frame, tracker.last_landmarks)
-
-        # Display last detected values
-        if last_gesture:
-            cv2.putText(frame, f"Gesture: {last_gesture}", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-        cv2.putText(frame, f"Fingers: {last_finger_count}", (10, 70),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-
-        # Calculate and display FPS
-        current_time = time.time()
-        fps = 1 / (current_time - prev_time)
-        prev_time = current_time
-        cv2.putText(frame, f"FPS: {int(fps)}", (10, frame.shape[0] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-
-        # Show frame
-        cv2.imshow('Gesture Controller (Optimized)', frame)
-
-        # Quit on 'q'
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
+    # Gesture last reported on the console in headless mode
+    reported_gesture = None
+
+    with grab_frames(cap) as grabber:
+        while True:
+            ret, frame = grabber.read()
+            if not ret:
+                break
+
+            frame_count += 1
+            frame_h, frame_w = frame.shape[:2]
+            current_time = time.monotonic()
+
+            # Flip frame horizontally for mirror effect
+            display = cv2.flip(cv2.UMat(frame) if use_umat else frame, 1)
+
+            # Only process hand detection every N frames for performance
+            if frame_count % process_every_n_frames == 0:
+                # Download from the GPU only on frames that run detection
+                frame = to_numpy(display)
+                hand_landmarks = tracker.get_hand_landmarks(frame, int(current_time * 1000))
+                frame_gesture = None
+
+                # Process gestures if hands detected
+                if hand_landmarks:
+                    hands = tracker.landmarks_to_array(hand_landmarks, (frame_h, frame_w))
+                    finger_counts = tracker.count_extended_fingers_batch(hands)
+                    pinches = tracker.detect_pinch_batch(hands)
+
+                    for i, landmarks in enumerate(hands):
+                        # Store wrist position history
+                        tracker.append_wrist(landmarks[0])
+
+                        # Detect gestures
+                        gesture = None
+
+                        # Check swipe
+                        swipe = tracker.detect_swipe(frame_w)
+                        if swipe and tracker.can_trigger_gesture(current_time):
+                            gesture = swipe
+                            tracker.mark_gesture_triggered(current_time)
+                            last_gesture = gesture
+
+                        # Check pinch
+                        if pinches[i]:
+                            gesture = "pinch"
+                            last_gesture = gesture
+
+                        # Count fingers
+                        last_finger_count = int(finger_counts[i])
+
+                        if gesture:
+                            frame_gesture = gesture
+
+                # Without a window, report gestures on the console instead, only when
+                # they change so a held pinch doesn't print every frame
+                if not show and frame_gesture != reported_gesture:
+                    if frame_gesture:
+                        print(f"Gesture: {frame_gesture}, Fingers: {last_finger_count}")
+                    reported_gesture = frame_gesture
+
+            if not show:
+                continue
+
+            # Always draw landmarks (even on skipped frames, use cached)
+            if tracker.last_landmarks:
+                tracker.draw_landmarks(display, tracker.last_landmarks, (frame_h, frame_w))
+
+            # Display last detected values
+            if last_gesture:
+                cv2.putText(display, f"Gesture: {last_gesture}", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+            cv2.putText(display, f"Fingers: {last_finger_count}", (10, 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+
+            # Calculate and display FPS
+            fps = 1 / (current_time - prev_time) if (current_time - prev_time) > 0 else 0
+            prev_time = current_time
+            cv2.putText(display, f"FPS: {int(fps)}", (10, frame_h - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+            # Show frame
+            cv2.imshow('Gesture Controller (Optimized)', display)
+
+            # Quit on 'q'
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+    if show:
+        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Hand tracking and gesture detection demo")
+    parser.add_argument("--no-display", action="store_true",
+                        help="run headless: print gestures instead of showing a window (quit with Ctrl+C)")
+    add_skin_gate_argument(parser)
+    args = parser.parse_args()
+
+    main(show=not args.no_display, skin_gate=args.skin_gate)
@@ -1,11 +1,14 @@
+import argparse
 import cv2
-from hand_tracker import HandTracker
+from hand_tracker import HandTracker, add_skin_gate_argument, enable_opencl, grab_frames, open_camera, to_numpy
 from spotify_controller import SpotifyController
 import time
 
 class GestureSpotifyController:
-    def __init__(self):
-        self.tracker = HandTracker()
+    def __init__(self, show=True, skin_gate=False):
+        # When False, skip all drawing and the preview window (gesture control only)
+        self.show = show
+        self.tracker = HandTracker(skin_gate=skin_gate)
         try:
             self.spotify = SpotifyController()
             self.spotify_enabled = True
@@ -48,14 +51,20 @@ class GestureSpotifyController:
         self.hand_appearance_cooldown = 0.6
         self.hand_was_visible = False
         
-        # Track info cache
-        self.cached_track_info = None
-        self.last_track_fetch_time = 0
-        self.track_fetch_interval = 2.0
+        # Capture small frames for inference and upscale only for display.
+        # Landmarks are normalized, so gestures are measured in display-size pixels
+        # to keep the pinch/finger/swipe thresholds tuned for a 640x480 frame
+        self.capture_size = (320, 240)
+        self.display_size = (640, 480)
         
-    def get_stable_finger_count(self, finger_count):
-        current_time = time.time()
+        # Swipe thresholds tuned for this controller (120/80 px at 640 wide)
+        self.tracker.swipe_horizontal_ratio = 120 / 640
+        self.tracker.swipe_vertical_ratio = 80 / 640
         
+        # Milliseconds scrubbed by moving the pinching hand across the full frame width
+        self.scrub_ms_per_frame_width = 160000
+        
+    def get_stable_finger_count(self, finger_count, current_time):
         if finger_count != self.stable_finger_count:
             self.stable_finger_count = finger_count
             self.finger_count_start_time = current_time
@@ -66,12 +75,11 @@ class GestureSpotifyController:
         
         return None
     
-    def handle_gestures(self, gesture, landmarks, finger_count):
+    def handle_gestures(self, gesture, landmarks, finger_count, current_time):
         if not self.spotify_enabled:
             return
         
-        stable_count = self.get_stable_finger_count(finger_count)
-        current_time = time.time()
+        stable_count = self.get_stable_finger_count(finger_count, current_time)
         time_since_swipe = current_time - self.last_swipe_time
         
         if gesture == "swipe_left":
@@ -139,18 +147,8 @@ class GestureSpotifyController:
             self.last_volume_time = current_time
             self.volume_gesture_armed = False
     
-    def get_track_info_cached(self):
-        current_time = time.time()
-        if current_time - self.last_track_fetch_time > self.track_fetch_interval:
-            self.cached_track_info = self.spotify.get_current_track_info()
-            self.last_track_fetch_time = current_time
-        return self.cached_track_info
-    
     def run(self):
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS, 30)
+        cap = open_camera(*self.capture_size)
         
         print("controls:")
         print("Swipe Left: Previous track")
@@ -159,188 +157,214 @@ class GestureSpotifyController:
         print("1 finger: Play/Pause")
         print("2 fingers: Volume up")
         print("3 fingers: Volume down")
-        print("Press 'q' to quit\n")
+        print("Press 'q' or Ctrl+C to quit\n" if self.show else "Press Ctrl+C to quit\n")
+        
+        # Run flip/resize/draw/display on the GPU via cv2.UMat when OpenCL is available
+        use_umat = self.show and enable_opencl()
+        display_w, display_h = self.display_size
+        display = None
         
         frame_count = 0
         process_every_n_frames = 2
-        prev_time = time.time()
+        prev_time = time.monotonic()
         last_hand_landmarks = None
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            frame = cv2.flip(frame, 1)
-            frame_count += 1
-            current_time = time.time()
-            
-            if frame_count % process_every_n_frames == 0:
-                hand_landmarks = self.tracker.get_hand_landmarks(frame)
-                if hand_landmarks:
-                    last_hand_landmarks = hand_landmarks
-                else:
-                    last_hand_landmarks = None
-            else:
-                hand_landmarks = last_hand_landmarks
-            
-            if self.tracker.last_landmarks:
-                self.tracker.draw_landmarks(frame, self.tracker.last_landmarks)
-            
-            swipe_zone_y = int(frame.shape[0] * 0.85)
-            cv2.line(frame, (0, swipe_zone_y), (frame.shape[1], swipe_zone_y), (100, 100, 100), 1)
-            cv2.putText(frame, "Swipe zone above", (10, swipe_zone_y - 5),
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.4, (100, 100, 100), 1)
-            
-            if self.spotify_enabled:
-                track_info = self.get_track_info_cached()
-                if track_info:
-                    status = ">" if track_info['is_playing'] else "||"
-                    text = f"{status} {track_info['name'][:30]} - {track_info['artist'][:20]}"
-                    cv2.putText(frame, text, (10, frame.shape[0] - 20),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            
-            fps = 1 / (current_time - prev_time) if (current_time - prev_time) > 0 else 0
-            prev_time = current_time
-            cv2.putText(frame, f"FPS: {int(fps)}", (frame.shape[1] - 100, 30),
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            
-            if hand_landmarks and len(hand_landmarks) > 0:
-                # Track hand appearance for cooldown
-                if not self.hand_was_visible:
-                    self.hand_first_seen_time = current_time
-                    self.hand_was_visible = True
-                    # Clear position history to prevent false swipe detection when hand first appears
-                    self.tracker.position_history.clear()
+        # Grab frames on their own thread so slow Spotify calls or inference never stall capture
+        with grab_frames(cap) as grabber:
+            while True:
+                ret, frame = grabber.read()
+                if not ret:
+                    break
                 
-                in_hand_appearance_cooldown = (current_time - self.hand_first_seen_time) < self.hand_appearance_cooldown
+                flipped = cv2.flip(cv2.UMat(frame) if use_umat else frame, 1)
+                frame_count += 1
+                # Read the clock once per iteration; monotonic time keeps cooldowns
+                # immune to wall-clock jumps
+                current_time = time.monotonic()
                 
-                all_hands_data = []
-                for hand_lms in hand_landmarks:
-                    landmarks = self.tracker.get_landmark_coords(hand_lms, frame.shape)
-                    finger_count = self.tracker.count_extended_fingers(landmarks)
-                    is_pinching = self.tracker.detect_pinch(landmarks)
-                    all_hands_data.append({
-                        'landmarks': landmarks,
-                        'finger_count': finger_count,
-                        'is_pinching': is_pinching,
-                        'wrist_x': landmarks[0][0],
-                        'wrist_y': landmarks[0][1]
-                    })
-                
-                scrub_trigger_hand = None
-                scrub_control_hand = None
-                
-                if len(all_hands_data) == 2:
-                    hand1, hand2 = all_hands_data
-                    if hand1['finger_count'] >= 4 and hand2['is_pinching']:
-                        scrub_trigger_hand = hand1
-                        scrub_control_hand = hand2
-                    elif hand2['finger_count'] >= 4 and hand1['is_pinching']:
-                        scrub_trigger_hand = hand2
-                        scrub_control_hand = hand1
+                if frame_count % process_every_n_frames == 0:
+                    # Download from the GPU only on frames that run detection
+                    frame = to_numpy(flipped)
+                    hand_landmarks = self.tracker.get_hand_landmarks(frame, int(current_time * 1000))
+                    if hand_landmarks:
+                        last_hand_landmarks = hand_landmarks
+                    else:
+                        last_hand_landmarks = None
+                else:
+                    hand_landmarks = last_hand_landmarks
                 
-                if scrub_trigger_hand and scrub_control_hand:
-                    pinch_x = scrub_control_hand['wrist_x']
+                if self.show:
+                    display = cv2.resize(flipped, self.display_size)
+                    
+                    if self.tracker.last_landmarks:
+                        self.tracker.draw_landmarks(display, self.tracker.last_landmarks, (display_h, display_w))
                     
-                    if not self.scrubbing_active:
-                        self.scrubbing_active = True
-                        self.scrub_start_x = pinch_x
-                        track_info = self.get_track_info_cached()
+                    swipe_zone_y = int(display_h * 0.85)
+                    cv2.line(display, (0, swipe_zone_y), (display_w, swipe_zone_y), (100, 100, 100), 1)
+                    cv2.putText(display, "Swipe zone above", (10, swipe_zone_y - 5),
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.4, (100, 100, 100), 1)
+                    
+                    if self.spotify_enabled:
+                        track_info = self.spotify.get_cached_track_info()
                         if track_info:
-                            self.scrub_start_progress = track_info['progress_ms']
-                        print("Scrubbing started")
-                    else:
-                        if self.scrub_start_x is not None and self.scrub_start_progress is not None:
-                            delta_x = pinch_x - self.scrub_start_x
-                            scrub_ms = int(delta_x * 250)
-                            
-                            if abs(scrub_ms) > 500 and (current_time - self.last_scrub_time) > 0.2:
-                                track_info = self.get_track_info_cached()
-                                if track_info:
-                                    new_position = max(0, min(
-                                        self.scrub_start_progress + scrub_ms,
-                                        track_info['duration_ms'] - 1000
-                                    ))
-                                    self.spotify.seek_position(int(new_position))
-                                    self.last_scrub_time = current_time
+                            status = ">" if track_info['is_playing'] else "||"
+                            text = f"{status} {track_info['name'][:30]} - {track_info['artist'][:20]}"
+                            cv2.putText(display, text, (10, display_h - 20),
+                                      cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
                     
-                    cv2.putText(frame, "SCRUBBING", (10, 110),
-                              cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                else:
-                    if self.scrubbing_active:
-                        print("Scrubbing ended")
-                        self.scrub_end_time = current_time
-                    self.scrubbing_active = False
-                    self.scrub_start_x = None
-                    self.scrub_start_progress = None
+                    fps = 1 / (current_time - prev_time) if (current_time - prev_time) > 0 else 0
+                    prev_time = current_time
+                    cv2.putText(display, f"FPS: {int(fps)}", (display_w - 100, 30),
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                
+                if hand_landmarks and len(hand_landmarks) > 0:
+                    # Track hand appearance for cooldown
+                    if not self.hand_was_visible:
+                        self.hand_first_seen_time = current_time
+                        self.hand_was_visible = True
+                        # Clear position history to prevent false swipe detection when hand first appears
+                        self.tracker.clear_wrist_history()
                     
-                    # If 2 hands visible but not scrubbing, block all single-hand gestures
-                    two_hands_visible = len(all_hands_data) == 2
+                    in_hand_appearance_cooldown = (current_time - self.hand_first_seen_time) < self.hand_appearance_cooldown
                     
-                    if two_hands_visible:
-                        cv2.putText(frame, "Two hands - scrub only", (10, 110),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 2)
-                        self.handle_gestures(None, None, 0)
-                        finger_count = all_hands_data[0]['finger_count']
-                        cv2.putText(frame, f"Fingers: {finger_count}", (10, 70),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-                    else:
-                        in_post_scrub_cooldown = (current_time - self.scrub_end_time) < self.post_scrub_cooldown
-                        in_any_cooldown = in_post_scrub_cooldown or in_hand_appearance_cooldown
-                        
-                        if in_any_cooldown:
-                            cv2.putText(frame, "Cooldown...", (10, 110),
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.7, (128, 128, 128), 2)
-                        
-                        hand_data = all_hands_data[0]
-                        landmarks = hand_data['landmarks']
-                        finger_count = hand_data['finger_count']
-                        
-                        self.tracker.position_history.append(landmarks)
+                    hands = self.tracker.landmarks_to_array(hand_landmarks, (display_h, display_w))
+                    finger_counts = self.tracker.count_extended_fingers_batch(hands)
+                    pinches = self.tracker.detect_pinch_batch(hands)
+                    
+                    all_hands_data = []
+                    for landmarks, finger_count, is_pinching in zip(hands, finger_counts, pinches):
+                        all_hands_data.append({
+                            'landmarks': landmarks,
+                            'finger_count': int(finger_count),
+                            'is_pinching': bool(is_pinching),
+                            'wrist_x': int(landmarks[0, 0]),
+                            'wrist_y': int(landmarks[0, 1])
+                        })
+                    
+                    scrub_trigger_hand = None
+                    scrub_control_hand = None
+                    
+                    if len(all_hands_data) == 2:
+                        hand1, hand2 = all_hands_data
+                        if hand1['finger_count'] >= 4 and hand2['is_pinching']:
+                            scrub_trigger_hand = hand1
+                            scrub_control_hand = hand2
+                        elif hand2['finger_count'] >= 4 and hand1['is_pinching']:
+                            scrub_trigger_hand = hand2
+                            scrub_control_hand = hand1
+                    
+                    if scrub_trigger_hand and scrub_control_hand:
+                        pinch_x = scrub_control_hand['wrist_x']
                         
-                        gesture = None
-                        frame_height = frame.shape[0]
-                        wrist_y = landmarks[0][1]
-                        hand_in_swipe_zone = wrist_y < (frame_height * 0.85)
+                        if not self.scrubbing_active:
+                            self.scrubbing_active = True
+                            self.scrub_start_x = pinch_x
+                            track_info = self.spotify.get_cached_track_info()
+                            if track_info:
+                                self.scrub_start_progress = track_info['progress_ms']
+                            print("Scrubbing started")
+                        else:
+                            if self.scrub_start_x is not None and self.scrub_start_progress is not None:
+                                delta_x = pinch_x - self.scrub_start_x
+                                scrub_ms = int(delta_x / display_w * self.scrub_ms_per_frame_width)
+                                
+                                if abs(scrub_ms) > 500 and (current_time - self.last_scrub_time) > 0.2:
+                                    track_info = self.spotify.get_cached_track_info()
+                                    if track_info:
+                                        new_position = max(0, min(
+                                            self.scrub_start_progress + scrub_ms,
+                                            track_info['duration_ms'] - 1000
+                                        ))
+                                        self.spotify.seek_position(int(new_position))
+                                        self.last_scrub_time = current_time
                         
-                        swipe = self.tracker.detect_swipe(landmarks)
-                        if swipe and self.tracker.can_trigger_gesture() and hand_in_swipe_zone and not in_any_cooldown:
-                            gesture = swipe
-                            self.tracker.mark_gesture_triggered()
+                        if self.show:
+                            cv2.putText(display, "SCRUBBING", (10, 110),
+                                      cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    else:
+                        if self.scrubbing_active:
+                            print("Scrubbing ended")
+                            self.scrub_end_time = current_time
+                        self.scrubbing_active = False
+                        self.scrub_start_x = None
+                        self.scrub_start_progress = None
                         
-                        if hand_data['is_pinching'] and not in_any_cooldown:
-                            gesture = "pinch"
+                        # If 2 hands visible but not scrubbing, block all single-hand gestures
+                        two_hands_visible = len(all_hands_data) == 2
                         
-                        if not in_any_cooldown:
-                            self.handle_gestures(gesture, landmarks, finger_count)
+                        if two_hands_visible:
+                            if self.show:
+                                cv2.putText(display, "Two hands - scrub only", (10, 110),
+                                          cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 2)
+                            self.handle_gestures(None, None, 0, current_time)
+                            finger_count = all_hands_data[0]['finger_count']
+                            if self.show:
+                                cv2.putText(display, f"Fingers: {finger_count}", (10, 70),
+                                          cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
                         else:
-                            self.handle_gestures(None, landmarks, 0)
-                        
-                        if gesture and not in_any_cooldown:
-                            cv2.putText(frame, f"Gesture: {gesture}", (10, 30),
-                                      cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                        
-                        cv2.putText(frame, f"Fingers: {finger_count}", (10, 70),
+                            in_post_scrub_cooldown = (current_time - self.scrub_end_time) < self.post_scrub_cooldown
+                            in_any_cooldown = in_post_scrub_cooldown or in_hand_appearance_cooldown
+                            
+                            if in_any_cooldown and self.show:
+                                cv2.putText(display, "Cooldown...", (10, 110),
+                                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (128, 128, 128), 2)
+                            
+                            hand_data = all_hands_data[0]
+                            landmarks = hand_data['landmarks']
+                            finger_count = hand_data['finger_count']
+                            
+                            self.tracker.append_wrist(landmarks[0])
+                            
+                            gesture = None
+                            wrist_y = landmarks[0, 1]
+                            hand_in_swipe_zone = wrist_y < (display_h * 0.85)
+                            
+                            swipe = self.tracker.detect_swipe(display_w)
+                            if swipe and self.tracker.can_trigger_gesture(current_time) and hand_in_swipe_zone and not in_any_cooldown:
+                                gesture = swipe
+                                self.tracker.mark_gesture_triggered(current_time)
+                            
+                            if hand_data['is_pinching'] and not in_any_cooldown:
+                                gesture = "pinch"
+                            
+                            if not in_any_cooldown:
+                                self.handle_gestures(gesture, landmarks, finger_count, current_time)
+                            else:
+                                self.handle_gestures(None, landmarks, 0, current_time)
+                            
+                            if gesture and not in_any_cooldown and self.show:
+                                cv2.putText(display, f"Gesture: {gesture}", (10, 30),
+                                          cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+                            
+                            if self.show:
+                                cv2.putText(display, f"Fingers: {finger_count}", (10, 70),
+                                          cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+                else:
+                    self.hand_was_visible = False
+                    self.scrubbing_active = False
+                    self.scrub_start_x = None
+                    self.scrub_start_progress = None
+                    self.handle_gestures(None, None, 0, current_time)
+                    if self.show:
+                        cv2.putText(display, "Fingers: 0", (10, 70),
                                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-            else:
-                self.hand_was_visible = False
-                self.scrubbing_active = False
-                self.scrub_start_x = None
-                self.scrub_start_progress = None
-                self.handle_gestures(None, None, 0)
-                cv2.putText(frame, "Fingers: 0", (10, 70),
-                          cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-            
-            cv2.imshow('Gesture Spotify Controller', frame)
-            
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+                
+                if self.show:
+                    cv2.imshow('Gesture Spotify Controller', display)
+                    
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
         
-        cap.release()
-        cv2.destroyAllWindows()
+        if self.show:
+            cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    controller = GestureSpotifyController()
+    parser = argparse.ArgumentParser(description="Control Spotify with hand gestures")
+    parser.add_argument("--no-display", action="store_true",
+                        help="run headless: no preview window or overlays (quit with Ctrl+C)")
+    add_skin_gate_argument(parser)
+    args = parser.parse_args()
+    
+    controller = GestureSpotifyController(show=not args.no_display, skin_gate=args.skin_gate)
     controller.run()
@@ -1,8 +1,18 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import os
+import queue
+import threading
+import time
 
 class SpotifyController:
+    # Actions that change the track or play state, so the cached track info is
+    # refreshed right after them instead of on the next regular poll
+    _TRACK_STATE_ACTIONS = frozenset(['_next_track', '_previous_track', '_play_pause'])
+
     def __init__(self):
         client_id = os.environ.get('SPOTIFY_CLIENT_ID')
         client_secret = os.environ.get('SPOTIFY_CLIENT_SECRET')
@@ -10,30 +20,136 @@ class SpotifyController:
         if not client_id or not client_secret:
             raise ValueError("SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET environment variables must be set")
         
+        # One session shared by the auth manager and the API client, with a pool per
+        # host (accounts + api) sized for the worker. The retry settings are copied
+        # from spotipy's Spotify._build_session defaults so 429/5xx responses still
+        # back off and retry; read=False keeps a timed-out POST/PUT (next track,
+        # play/pause) from being sent twice
+        retry = Retry(
+            total=3,
+            connect=None,
+            read=False,
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE'])
+        )
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry))
+
         self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
             client_id=client_id,
             client_secret=client_secret,
             redirect_uri='http://127.0.0.1:8888/callback',
-            scope='user-modify-playback-state user-read-playback-state'
-        ))
+            scope='user-modify-playback-state user-read-playback-state',
+            requests_session=session
+        ), requests_session=session)
+
+        # Track info is refreshed in the background and served from this cache
+        self.track_info_interval = 2.0
+        self._cached_info = None
+        self._last_info_fetch = 0
+        self._info_lock = threading.Lock()
+        self._info_fetched = threading.Event()
+
+        # Seeks and volume steps arrive faster than the API can serve them, so keep
+        # only the latest seek target and the summed volume delta until the worker
+        # gets to them instead of queueing every intermediate request
+        self._pending_lock = threading.Lock()
+        self._pending_seek = None
+        self._pending_volume_delta = None
+
+        # Web API calls are slow round-trips, so run them on a worker thread
+        # instead of blocking the caller
+        self._q = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
 
         print("Spotify controller initialized!")
 
+    def _worker(self):
+        """Run queued playback actions and periodically refresh track info"""
+        while True:
+            timeout = max(0, self._last_info_fetch + self.track_info_interval - time.monotonic())
+            try:
+                method_name, args = self._q.get(timeout=timeout)
+            except queue.Empty:
+                self._refresh_track_info()
+                continue
+
+            getattr(self, method_name)(*args)
+            # Track or play state changed, so refresh track info once the queue drains.
+            # Seeks and volume steps wait for the regular poll to keep API traffic down
+            if method_name in self._TRACK_STATE_ACTIONS:
+                self._last_info_fetch = 0
+
+    def _refresh_track_info(self):
+        info = self.get_current_track_info()
+        with self._info_lock:
+            self._cached_info = info
+            self._last_info_fetch = time.monotonic()
+        self._info_fetched.set()
+
+    def get_cached_track_info(self, wait=False):
+        """Get the most recently fetched track info; wait=True blocks until the first fetch is done"""
+        if wait:
+            self._info_fetched.wait()
+        with self._info_lock:
+            return self._cached_info
+
     def next_track(self):
+        self._q.put(('_next_track', ()))
+
+    def previous_track(self):
+        self._q.put(('_previous_track', ()))
+
+    def play_pause(self):
+        self._q.put(('_play_pause', ()))
+
+    def set_volume(self, volume_percent):
+        self._q.put(('_set_volume', (volume_percent,)))
+
+    def adjust_volume(self, delta):
+        """Adjust volume by delta amount"""
+        with self._pending_lock:
+            queued = self._pending_volume_delta is not None
+            self._pending_volume_delta = (self._pending_volume_delta or 0) + delta
+        if not queued:
+            self._q.put(('_flush_volume', ()))
+
+    def seek_position(self, position_ms):
+        with self._pending_lock:
+            queued = self._pending_seek is not None
+            self._pending_seek = position_ms
+        if not queued:
+            self._q.put(('_flush_seek', ()))
+
+    def _flush_volume(self):
+        with self._pending_lock:
+            delta, self._pending_volume_delta = self._pending_volume_delta, None
+        if delta:
+            self._adjust_volume(delta)
+
+    def _flush_seek(self):
+        with self._pending_lock:
+            position_ms, self._pending_seek = self._pending_seek, None
+        if position_ms is not None:
+            self._seek_position(position_ms)
+
+    def _next_track(self):
         try:
             self.sp.next_track()
             print("Next track")
         except Exception as e:
             print(f"Error skipping track: {e}")
 
-    def previous_track(self):
+    def _previous_track(self):
         try:
             self.sp.previous_track()
             print("Previous track")
         except Exception as e:
             print(f"Error going to previous track: {e}")
 
-    def play_pause(self):
+    def _play_pause(self):
         try:
             playback = self.sp.current_playback()
             if playback and playback['is_playing']:
@@ -45,7 +161,7 @@ class SpotifyController:
         except Exception as e:
             print(f"Error toggling playback: {e}")
 
-    def set_volume(self, volume_percent):
+    def _set_volume(self, volume_percent):
         try:
             volume_percent = max(0, min(100, volume_percent))
             self.sp.volume(volume_percent)
@@ -53,18 +169,17 @@ class SpotifyController:
         except Exception as e:
             print(f"Error setting volume: {e}")
 
-    def adjust_volume(self, delta):
-        """Adjust volume by delta amount"""
+    def _adjust_volume(self, delta):
         try:
             playback = self.sp.current_playback()
             if playback:
                 current_volume = playback['device']['volume_percent']
                 new_volume = max(0, min(100, current_volume + delta))
-                self.set_volume(new_volume)
+                self._set_volume(new_volume)
         except Exception as e:
             print(f"Error adjusting volume: {e}")
 
-    def seek_position(self, position_ms):
+    def _seek_position(self, position_ms):
         try:
             self.sp.seek_track(position_ms)
             print(f"Seeked to {position_ms // 1000}s")
@@ -93,8 +208,9 @@ class SpotifyController:
 if __name__ == "__main__":
     controller = SpotifyController()
 
-    # Get current track info
-    info = controller.get_current_track_info()
+    # Get current track info from the worker, which handles the first-run auth flow;
+    # fetching it here too would race the worker for the OAuth callback port
+    info = controller.get_cached_track_info(wait=True)
     if info:
         print(f"Now playing: {info['name']} by {info['artist']}")
         print(f"Progress: {info['progress_ms']//1000}s / {info['duration_ms']//1000}s")
\ No newline at end of file